@@ -1,18 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, font
-import threading
 import time
 import random
+import statistics
+from collections import deque
 from typing import Dict, List, Optional, Tuple
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # Import from our memory_allocation_engine module
-from memory_allocation_engine import MemoryManager, ProcessGenerator, AllocationMethod
+from memory_allocation_engine import MemoryManager, ProcessGenerator, AllocationMethod, format_timestamp
 # Import visualization classes
 from visualization import MemoryVisualizer, ModernUI
 
 # Memory Visualizer GUI
 class MemoryVisualizerGUI:
+    # Oldest lines are trimmed from the event log beyond this many
+    LOG_MAX_LINES = 500
+    # Target delay between visualization refreshes
+    REFRESH_INTERVAL_MS = 100
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Memory Allocation Visualizer")
@@ -30,10 +36,17 @@ class MemoryVisualizerGUI:
         self.allocation_method = AllocationMethod.PAGING
         
         self.simulation_running = False
-        self.simulation_thread = None
-        self.simulation_speed = 1.0
+        # Tk `after` ids of the pending simulation step and auto-removals
+        self._simulation_job = None
+        self._removal_jobs = {}
         self.auto_generate_processes = False # New flag for auto process generation
         
+        # Durations of recent refreshes, used to keep the refresh rate on target
+        self._refresh_durations = deque(maxlen=50)
+        # (memory manager, version, method) last drawn; refreshes are skipped while unchanged
+        self._rendered_state = None
+        # Stats last written to the stats panel; the Text widget is only rewritten on change
+        self._last_stats_sig = None
         
         self.main_frame = ttk.Frame(self.root)
         self.main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -93,6 +106,7 @@ class MemoryVisualizerGUI:
         allocation_method_combo = ttk.Combobox(controls_grid, textvariable=self.allocation_method_var, 
                                                values=["paging", "segmentation"], state="readonly", width=12)
         allocation_method_combo.grid(row=2, column=1, padx=5, pady=8, sticky="w")
+        allocation_method_combo.bind("<<ComboboxSelected>>", self._on_method_changed)
         
         ttk.Label(controls_grid, text="Simulation Speed:").grid(row=3, column=0, padx=5, pady=8, sticky="w")
         self.speed_var = tk.DoubleVar(value=1.0)
@@ -132,6 +146,13 @@ class MemoryVisualizerGUI:
                                             style="Success.TButton", command=self._toggle_simulation)
         self.start_stop_button.pack(fill=tk.X, padx=10, pady=(0, 10))
     
+    def _on_method_changed(self, event=None):
+        """Cache the selected allocation method so callers skip the Tcl round trip"""
+        if self.allocation_method_var.get() == "paging":
+            self.allocation_method = AllocationMethod.PAGING
+        else:
+            self.allocation_method = AllocationMethod.SEGMENTATION
+    
     def _toggle_auto_generate(self):
         """Toggle auto-generation of processes"""
         self.auto_generate_processes = self.auto_generate_var.get()
@@ -204,30 +225,41 @@ class MemoryVisualizerGUI:
         self.stats_text.configure(state="disabled")
     
     def _update_visualization(self):
+        method = "paging" if self.allocation_method == AllocationMethod.PAGING else "segmentation"
+        state = (self.memory_manager, self.memory_manager.version, method)
+        if state == self._rendered_state:
+            self.root.after(self.REFRESH_INTERVAL_MS, self._update_visualization)
+            return
+        self._rendered_state = state
+        
+        started = time.perf_counter()
         memory_snapshot = self.memory_manager.get_memory_snapshot()
         page_table_snapshot = self.memory_manager.get_page_table_snapshot()
         stats = self.memory_manager.get_memory_stats()
         events = self.memory_manager.get_recent_events()
         
-        method = self.allocation_method_var.get()
-        self.visualizer.update_visualization(memory_snapshot, page_table_snapshot, stats, events,
-                                             self.memory_size, self.page_size, method)
-        self.canvas.draw_idle()
+        self.visualizer.request_update(memory_snapshot, page_table_snapshot, stats, events,
+                                       self.memory_size, self.page_size, method)
         self._update_stats(stats)
         self._update_log(events)
-        self.root.after(100, self._update_visualization)
+        
+        self._refresh_durations.append(time.perf_counter() - started)
+        predicted_ms = statistics.median(self._refresh_durations) * 1000
+        self.root.after(max(10, int(self.REFRESH_INTERVAL_MS - predicted_ms)), self._update_visualization)
     
     def _update_stats(self, stats):
+        signature = tuple(sorted(stats.items()))
+        if signature == self._last_stats_sig:
+            return
+        self._last_stats_sig = signature
+        
         self.stats_text.configure(state="normal")
         self.stats_text.delete(1.0, tk.END)
         self.stats_text.insert(tk.END, "Memory Utilization\n", "heading")
         self.stats_text.insert(tk.END, f"Total Memory: {stats.get('total_memory', 0)} units\n")
         self.stats_text.insert(tk.END, f"Used Memory: {stats.get('used_memory', 0)} units\n")
         self.stats_text.insert(tk.END, f"Free Memory: {stats.get('free_memory', 0)} units\n")
-        utilization = 0
-        if stats.get('total_memory', 0) > 0:
-            utilization = (stats.get('used_memory', 0) / stats.get('total_memory', 0)) * 100
-        self.stats_text.insert(tk.END, f"Utilization: {utilization:.1f}%\n\n")
+        self.stats_text.insert(tk.END, f"Utilization: {stats.get('used_percentage', 0):.1f}%\n\n")
         self.stats_text.insert(tk.END, "Active Processes\n", "heading")
         self.stats_text.insert(tk.END, f"Process Count: {stats.get('process_count', 0)}\n")
         # Display fragmentation information
@@ -241,14 +273,21 @@ class MemoryVisualizerGUI:
         pass
     
     def _log_message(self, message, message_type="info"):
-        timestamp = time.strftime("%H:%M:%S", time.localtime())
+        timestamp = format_timestamp(int(time.time()))
         self.log_text.insert(tk.END, f"[{timestamp}] ", "timestamp")
         self.log_text.insert(tk.END, f"{message}\n", message_type)
+        # The last line is the empty one after the trailing newline
+        excess = int(self.log_text.index("end-1c").split(".")[0]) - 1 - self.LOG_MAX_LINES
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
         self.log_text.see(tk.END)
     
     def _toggle_simulation(self):
         if self.simulation_running:
             self.simulation_running = False
+            if self._simulation_job is not None:
+                self.root.after_cancel(self._simulation_job)
+                self._simulation_job = None
             self.start_stop_var.set("Start Simulation")
             self._log_message("Simulation stopped", "info")
         else:
@@ -268,19 +307,17 @@ class MemoryVisualizerGUI:
                 self.pending_processes.clear()  # Clear pending queue after allocation
 
             if self.auto_generate_processes:
-                self.simulation_thread = threading.Thread(target=self._run_simulation)
-                self.simulation_thread.daemon = True
-                self.simulation_thread.start()
-
-
+                self._log_message("Auto-generating processes...", "info")
+                self._simulation_step()
     
-    def _run_simulation(self):
-        """This method only runs if auto-generate processes is enabled"""
-        self._log_message("Auto-generating processes...", "info")
-        while self.simulation_running and self.auto_generate_processes:
-            # Add random process only if auto-generate is enabled
-            self._add_random_process()
-            time.sleep(self.simulation_speed)
+    def _simulation_step(self):
+        """Add one random process and schedule the next step on the Tk event loop"""
+        self._simulation_job = None
+        # Steps only continue while auto-generate processes is enabled
+        if not (self.simulation_running and self.auto_generate_processes):
+            return
+        self._add_random_process()
+        self._simulation_job = self.root.after(int(self.speed_var.get() * 1000), self._simulation_step)
     
 
     def _add_process(self):
@@ -301,8 +338,7 @@ class MemoryVisualizerGUI:
                 # Generate a unique process ID
                 process_id = self._generate_unique_process_id()
 
-            method_str = self.allocation_method_var.get()
-            method = AllocationMethod.PAGING if method_str == "paging" else AllocationMethod.SEGMENTATION
+            method = self.allocation_method
 
             # Read lifetime for this process
             lifetime = float(self.process_lifetime_var.get())
@@ -348,13 +384,17 @@ class MemoryVisualizerGUI:
             self._log_message("Start simulation before adding processes", "error")
             return
             
+        try:
+            lifetime = float(self.process_lifetime_var.get())
+        except ValueError:
+            self._log_message("Invalid process lifetime", "error")
+            return
+        
         process_id, size = self.process_generator.generate_process()
-        method_str = self.allocation_method_var.get()
-        method = AllocationMethod.PAGING if method_str == "paging" else AllocationMethod.SEGMENTATION
-        success = self.memory_manager.allocate_process(process_id, size, method)
+        success = self.memory_manager.allocate_process(process_id, size, self.allocation_method)
         if success:
             self._log_message(f"Added random process {process_id} with size {size}", "success")
-            self._schedule_auto_removal(process_id)
+            self._schedule_auto_removal(process_id, lifetime)
         else:
             self._log_message(f"Failed to allocate random process {process_id} with size {size}", "error")
     
@@ -369,6 +409,7 @@ class MemoryVisualizerGUI:
             if success:
                 # Remove process ID from allocated set
                 self.allocated_process_ids.discard(process_id)
+                self._cancel_auto_removal(process_id)
                 self._log_message(f"Removed process {process_id}", "success")
             else:
                 self._log_message(f"Failed to remove process {process_id}", "error")
@@ -385,6 +426,9 @@ class MemoryVisualizerGUI:
             if new_memory_size % new_page_size != 0:
                 self._log_message("Memory size must be a multiple of page size", "error")
                 return
+            if new_memory_size == self.memory_size and new_page_size == self.page_size:
+                self._log_message("Settings unchanged", "info")
+                return
             self.memory_size = new_memory_size
             self.page_size = new_page_size
             self._reset_simulation()
@@ -395,19 +439,28 @@ class MemoryVisualizerGUI:
     def _reset_simulation(self):
         if self.simulation_running:
             self._toggle_simulation()
-        self.memory_manager = MemoryManager(self.memory_size, self.page_size)
+        if (self.memory_manager.memory_size, self.memory_manager.page_size) == (self.memory_size, self.page_size):
+            self.memory_manager.clear()
+        else:
+            self.memory_manager = MemoryManager(self.memory_size, self.page_size)
+        for process_id in list(self._removal_jobs):
+            self._cancel_auto_removal(process_id)
         self.process_generator.next_pid = 1
         # Clear the set of allocated process IDs
         self.allocated_process_ids.clear()
         self._log_message("Simulation reset", "info")
     
     def _schedule_auto_removal(self, process_id, lifetime):
-        timer = threading.Timer(lifetime, self._auto_remove_process, args=(process_id,))
-        timer.daemon = True
-        timer.start()
-
+        self._cancel_auto_removal(process_id)
+        self._removal_jobs[process_id] = self.root.after(int(lifetime * 1000), self._auto_remove_process, process_id)
+    
+    def _cancel_auto_removal(self, process_id):
+        job = self._removal_jobs.pop(process_id, None)
+        if job is not None:
+            self.root.after_cancel(job)
     
     def _auto_remove_process(self, process_id):
+        self._removal_jobs.pop(process_id, None)
         # Only try to remove if simulation is still running
         if self.simulation_running:
             removed = self.memory_manager.deallocate_process(process_id)
@@ -17,11 +17,6 @@ def on_close():
     """
     Handle the window close event.
     """
-    # Clean up resources
-    import matplotlib.pyplot as plt
-    
-    plt.close('all')
-    
     # Exit the application
     import sys
     sys.exit(0)
@@ -1,24 +1,90 @@
 from enum import Enum, auto
+from functools import lru_cache
+from bisect import bisect_left, insort
+from collections import deque
+from itertools import islice
 import time
 from typing import Dict, List, Optional, Tuple
-import random
+import numpy as np
+
+# Clock time of a whole-second timestamp; many events share the same second
+@lru_cache(maxsize=256)
+def format_timestamp(seconds):
+    return time.strftime('%H:%M:%S', time.localtime(seconds))
+
 # Define the AllocationMethod enum
 class AllocationMethod(Enum):
     PAGING = auto()
     SEGMENTATION = auto()
 
+# Contiguous memory block, linked to its neighbours in address order
+class MemoryBlock:
+    __slots__ = ('start', 'size', 'process_id', 'prev', 'next')
+    
+    def __init__(self, start, size, process_id=None):
+        self.start = start
+        self.size = size
+        self.process_id = process_id
+        self.prev = None
+        self.next = None
+    
+    @property
+    def end(self):
+        return self.start + self.size - 1
+
 # Memory Manager class
 class MemoryManager:
+    # (event_type, details format) pairs; logged events refer to them by index
+    EVENT_TEMPLATES = (
+        ("Allocation", "Allocated {} pages for size {}"),
+        ("Allocation", "Allocated segment of size {} at address {}"),
+        ("Allocation Failed", "Not enough free frames. Needed {}, available {}"),
+        ("Allocation Failed", "No suitable free block found for size {}"),
+        ("Deallocation", "Process removed from memory"),
+    )
+    EVENT_PAGES_ALLOCATED, EVENT_SEGMENT_ALLOCATED, EVENT_FRAMES_EXHAUSTED, EVENT_NO_FREE_BLOCK, EVENT_DEALLOCATED = range(5)
 
     def __init__(self, memory_size, page_size):
         self.memory_size = memory_size
         self.page_size = page_size
-        self.memory = [{'start': 0, 'end': memory_size - 1, 'size': memory_size, 'process_id': None}]
-        self.page_table = [{'frame_id': i, 'process_id': None, 'start_address': i * page_size, 
-                           'end_address': (i + 1) * page_size - 1} 
-                          for i in range(memory_size // page_size)]
+        # Scales used memory to a percentage without dividing on every stats update
+        self._pct_scale = 100.0 / memory_size if memory_size > 0 else 0
+        # Blocks form a doubly linked list from self.head, indexed by start address;
+        # free blocks are also kept as sorted (size, start) pairs for best-fit lookup
+        self.head = None
+        self.blocks_by_start = {}
+        self.free_by_size = []
+        # Running totals behind get_memory_stats
+        self.used_memory = 0
+        self.internal_fragmentation = 0
+        self._link_blocks([MemoryBlock(0, memory_size)])
+        num_frames = memory_size // page_size
+        # Owning process id of each page frame, -1 while the frame is free
+        self.frame_owner = np.full(num_frames, -1, dtype=np.int32)
+        # Candidate free frame ids. Segmentation claims frames without removing them,
+        # so paging skips entries that have since been taken; frame_queued keeps
+        # each frame in the deque at most once.
+        self.free_frames = deque(range(num_frames))
+        self.frame_queued = np.ones(num_frames, dtype=bool)
+        self.free_frame_count = num_frames
+        # Set when paging changed frame_owner and the block list needs rebuilding
+        self._memory_stale = False
+        # Memoized snapshots and stats, dropped whenever memory changes
+        self._snapshot_cache = {}
+        # Bumped on every change so callers can tell when to redraw
+        self.version = 0
         self.allocated_processes = {}
-        self.recent_events = []
+        # Allocation and deallocation routines for each AllocationMethod
+        self._alloc_funcs = {
+            AllocationMethod.PAGING: self._allocate_process_paging,
+            AllocationMethod.SEGMENTATION: self._allocate_process_segmentation
+        }
+        self._dealloc_funcs = {
+            AllocationMethod.PAGING: self._deallocate_process_paging,
+            AllocationMethod.SEGMENTATION: self._deallocate_process_segmentation
+        }
+        self.recent_events = deque(maxlen=10)
+        self._recent_events_view = None
         self.stats = {
             'total_memory': memory_size,
             'used_memory': 0,
@@ -30,192 +96,290 @@ class MemoryManager:
             'internal_fragmentation': 0
         }
     
+    def clear(self):
+        # Drop every process and event while reusing the frame table
+        self.frame_owner.fill(-1)
+        self.free_frames = deque(range(len(self.frame_owner)))
+        self.frame_queued.fill(True)
+        self.free_frame_count = len(self.frame_owner)
+        self._memory_stale = False
+        self._link_blocks([MemoryBlock(0, self.memory_size)])
+        self.internal_fragmentation = 0
+        self.allocated_processes.clear()
+        self.recent_events.clear()
+        self._recent_events_view = None
+        self._mark_dirty()
+    
     def get_memory_snapshot(self):
-        return self.memory.copy()
+        if 'memory' not in self._snapshot_cache:
+            self._sync_memory()
+            self._snapshot_cache['memory'] = [
+                {'start': block.start, 'end': block.end, 'size': block.size, 'process_id': block.process_id}
+                for block in self._iter_blocks()]
+        return self._snapshot_cache['memory']
     
     def get_page_table_snapshot(self):
-        return self.page_table.copy()
+        if 'page_table' not in self._snapshot_cache:
+            page_size = self.page_size
+            self._snapshot_cache['page_table'] = [
+                {'frame_id': i, 'process_id': owner if owner >= 0 else None,
+                 'start_address': i * page_size, 'end_address': (i + 1) * page_size - 1}
+                for i, owner in enumerate(self.frame_owner.tolist())]
+        return self._snapshot_cache['page_table']
     
     def get_memory_stats(self):
-        return self.stats.copy()
+        if 'stats' not in self._snapshot_cache:
+            self._update_stats()
+            self._snapshot_cache['stats'] = self.stats.copy()
+        return self._snapshot_cache['stats']
     
-    def get_recent_events(self):
-        return self.recent_events[-5:] if self.recent_events else []
+    def get_recent_events(self, limit=5):
+        # Oldest-first window of at most `limit` events, cached as (limit, events)
+        # until the next event is logged
+        if self._recent_events_view is None or self._recent_events_view[0] != limit:
+            events = deque(maxlen=limit)
+            for timestamp, timestamp_str, process_id, template_id, args in islice(reversed(self.recent_events), limit):
+                event_type, details = self.EVENT_TEMPLATES[template_id]
+                events.appendleft({
+                    'timestamp': timestamp,
+                    'timestamp_str': timestamp_str,
+                    'process_id': process_id,
+                    'event_type': event_type,
+                    'details': details.format(*args)
+                })
+            self._recent_events_view = (limit, events)
+        return self._recent_events_view[1]
     
     def allocate_process(self, process_id, size, method):
-        if method == AllocationMethod.PAGING:
-            return self._allocate_process_paging(process_id, size)
-        else:
-            return self._allocate_process_segmentation(process_id, size)
+        allocated = self._alloc_funcs[method](process_id, size)
+        if allocated:
+            self._mark_dirty()
+        return allocated
     
     def _allocate_process_paging(self, process_id, size):
         pages_needed = (size + self.page_size - 1) // self.page_size
-        free_frames = [frame for frame in self.page_table if frame['process_id'] is None]
         
-        if len(free_frames) < pages_needed:
-            self._log_event(process_id, "Allocation Failed", f"Not enough free frames. Needed {pages_needed}, available {len(free_frames)}")
+        if self.free_frame_count < pages_needed:
+            self._log_event(process_id, self.EVENT_FRAMES_EXHAUSTED, pages_needed, self.free_frame_count)
             return False
         
-        allocated_frames = free_frames[:pages_needed]
-        for frame in allocated_frames:
-            frame['process_id'] = process_id
+        allocated_frames = np.fromiter(self._pop_free_frames(pages_needed), dtype=np.int32, count=pages_needed)
+        self.frame_owner[allocated_frames] = process_id
+        self.free_frame_count -= pages_needed
         
-        self._update_memory_from_page_table()
+        self._memory_stale = True
+        self.used_memory += pages_needed * self.page_size
+        self.internal_fragmentation += pages_needed * self.page_size - size
         self.allocated_processes[process_id] = {
             'size': size,
-            'frames': [frame['frame_id'] for frame in allocated_frames],
-            'method': 'paging'
+            'frames': allocated_frames,
+            'method': AllocationMethod.PAGING
         }
-        self._update_stats()
-        self._log_event(process_id, "Allocation", f"Allocated {pages_needed} pages for size {size}")
+        self._log_event(process_id, self.EVENT_PAGES_ALLOCATED, pages_needed, size)
         return True
     
     def _allocate_process_segmentation(self, process_id, size):
-        for i, block in enumerate(self.memory):
-            if block['process_id'] is None and block['size'] >= size:
-                if block['size'] == size:
-                    block['process_id'] = process_id
-                else:
-                    end_addr = block['start'] + size - 1
-                    new_block = {
-                        'start': block['start'] + size,
-                        'end': block['end'],
-                        'size': block['size'] - size,
-                        'process_id': None
-                    }
-                    block['end'] = end_addr
-                    block['size'] = size
-                    block['process_id'] = process_id
-                    self.memory.insert(i + 1, new_block)
-                
-                start_page = block['start'] // self.page_size
-                end_page = block['end'] // self.page_size
-                for frame in self.page_table:
-                    if start_page <= frame['frame_id'] <= end_page:
-                        frame['process_id'] = process_id
-                
-                self.allocated_processes[process_id] = {
-                    'size': size,
-                    'start': block['start'],
-                    'end': block['end'],
-                    'method': 'segmentation'
-                }
-                self._update_stats()
-                self._log_event(process_id, "Allocation", f"Allocated segment of size {size} at address {block['start']}")
-                return True
+        self._sync_memory()
+        # Best fit: the smallest free block that holds size, lowest address first
+        i = bisect_left(self.free_by_size, (size,))
+        if i == len(self.free_by_size):
+            self._log_event(process_id, self.EVENT_NO_FREE_BLOCK, size)
+            return False
         
-        self._log_event(process_id, "Allocation Failed", f"No suitable free block found for size {size}")
-        return False
+        block = self.blocks_by_start[self.free_by_size.pop(i)[1]]
+        if block.size > size:
+            self._split_block(block, size)
+        block.process_id = process_id
+        self.used_memory += size
+        
+        start_page = block.start // self.page_size
+        end_page = block.end // self.page_size
+        frames = self.frame_owner[start_page:end_page + 1]
+        # Claimed frames stay queued; paging skips them when it reaches them
+        self.free_frame_count -= int(np.count_nonzero(frames < 0))
+        frames[:] = process_id
+        
+        self.allocated_processes[process_id] = {
+            'size': size,
+            'start': block.start,
+            'end': block.end,
+            'method': AllocationMethod.SEGMENTATION
+        }
+        self._log_event(process_id, self.EVENT_SEGMENT_ALLOCATED, size, block.start)
+        return True
     
     def deallocate_process(self, process_id):
         if process_id not in self.allocated_processes:
             return False
         
-        process_info = self.allocated_processes[process_id]
-        
-        if process_info['method'] == 'paging':
-            for frame_id in process_info['frames']:
-                for frame in self.page_table:
-                    if frame['frame_id'] == frame_id:
-                        frame['process_id'] = None
-            self._update_memory_from_page_table()
-        else:
-            for block in self.memory:
-                if block['process_id'] == process_id:
-                    block['process_id'] = None
-                    start_page = block['start'] // self.page_size
-                    end_page = block['end'] // self.page_size
-                    for frame in self.page_table:
-                        if start_page <= frame['frame_id'] <= end_page:
-                            frame['process_id'] = None
-                    break
-            self._merge_free_blocks()
-        
-        del self.allocated_processes[process_id]
-        self._update_stats()
-        self._log_event(process_id, "Deallocation", "Process removed from memory")
+        process_info = self.allocated_processes.pop(process_id)
+        self._dealloc_funcs[process_info['method']](process_id, process_info)
+        self._mark_dirty()
+        self._log_event(process_id, self.EVENT_DEALLOCATED)
         return True
     
+    def _deallocate_process_paging(self, process_id, process_info):
+        self.frame_owner[process_info['frames']] = -1
+        self._push_free_frames(process_info['frames'])
+        self._memory_stale = True
+        allocated_size = len(process_info['frames']) * self.page_size
+        self.used_memory -= allocated_size
+        self.internal_fragmentation -= allocated_size - process_info['size']
+    
+    def _deallocate_process_segmentation(self, process_id, process_info):
+        self._sync_memory()
+        block = self.blocks_by_start.get(process_info['start'])
+        if block is None or block.process_id != process_id:
+            # Rebuilding blocks after paging may have moved the segment to frame boundaries
+            block = next((b for b in self._iter_blocks() if b.process_id == process_id), None)
+        if block is not None:
+            start_page = block.start // self.page_size
+            end_page = block.end // self.page_size
+            frames = self.frame_owner[start_page:end_page + 1]
+            released = np.flatnonzero(frames >= 0) + start_page
+            frames[:] = -1
+            self._push_free_frames(released)
+            self.used_memory -= block.size
+            self._release_block(block)
+    
+    def _pop_free_frames(self, count):
+        # Yield count free frames, dropping queued entries segmentation has claimed
+        owner = self.frame_owner
+        while count:
+            frame_id = self.free_frames.popleft()
+            self.frame_queued[frame_id] = False
+            if owner[frame_id] < 0:
+                count -= 1
+                yield frame_id
+    
+    def _push_free_frames(self, frame_ids):
+        # Count newly freed frames and queue those not already in the deque
+        self.free_frame_count += len(frame_ids)
+        frame_ids = frame_ids[~self.frame_queued[frame_ids]]
+        self.frame_queued[frame_ids] = True
+        self.free_frames.extend(frame_ids.tolist())
+    
+    def _mark_dirty(self):
+        self._snapshot_cache.clear()
+        self.version += 1
+    
+    def _sync_memory(self):
+        if self._memory_stale:
+            self._update_memory_from_page_table()
+            self._memory_stale = False
+    
     def _update_memory_from_page_table(self):
-        self.memory = []
-        current_block = None
-        for frame in sorted(self.page_table, key=lambda x: x['frame_id']):
-            start_addr = frame['start_address']
-            end_addr = frame['end_address']
-            process_id = frame['process_id']
-            if current_block is None or current_block['process_id'] != process_id:
-                if current_block is not None:
-                    self.memory.append(current_block)
-                current_block = {
-                    'start': start_addr,
-                    'end': end_addr,
-                    'size': end_addr - start_addr + 1,
-                    'process_id': process_id
-                }
-            else:
-                current_block['end'] = end_addr
-                current_block['size'] = current_block['end'] - current_block['start'] + 1
-        if current_block is not None:
-            self.memory.append(current_block)
-    
-    def _merge_free_blocks(self):
-        i = 0
-        while i < len(self.memory) - 1:
-            if self.memory[i]['process_id'] is None and self.memory[i+1]['process_id'] is None:
-                self.memory[i]['end'] = self.memory[i+1]['end']
-                self.memory[i]['size'] += self.memory[i+1]['size']
-                self.memory.pop(i+1)
-            else:
-                i += 1
+        # Run-length encode frame_owner into one block per run of equal owners
+        blocks = []
+        owner = self.frame_owner
+        if len(owner) > 0:
+            run_ends = np.flatnonzero(np.diff(owner)) + 1
+            run_starts = np.concatenate(([0], run_ends))
+            run_ends = np.append(run_ends, len(owner))
+            for run_start, run_end, process_id in zip(run_starts.tolist(), run_ends.tolist(),
+                                                      owner[run_starts].tolist()):
+                blocks.append(MemoryBlock(run_start * self.page_size,
+                                          (run_end - run_start) * self.page_size,
+                                          process_id if process_id >= 0 else None))
+        self._link_blocks(blocks)
+    
+    def _link_blocks(self, blocks):
+        for prev_block, block in zip(blocks, blocks[1:]):
+            prev_block.next = block
+            block.prev = prev_block
+        self.head = blocks[0] if blocks else None
+        self.blocks_by_start = {block.start: block for block in blocks}
+        self.free_by_size = sorted((block.size, block.start) for block in blocks if block.process_id is None)
+        self.used_memory = sum(block.size for block in blocks if block.process_id is not None)
+    
+    def _iter_blocks(self):
+        block = self.head
+        while block is not None:
+            yield block
+            block = block.next
+    
+    def _split_block(self, block, size):
+        # Shrink block to size and link the remainder after it as a free block
+        rest = MemoryBlock(block.start + size, block.size - size)
+        rest.prev = block
+        rest.next = block.next
+        if block.next is not None:
+            block.next.prev = rest
+        block.next = rest
+        block.size = size
+        self.blocks_by_start[rest.start] = rest
+        insort(self.free_by_size, (rest.size, rest.start))
+    
+    def _release_block(self, block):
+        # Free block and coalesce it with free neighbours
+        block.process_id = None
+        if block.next is not None and block.next.process_id is None:
+            self._unindex_free(block.next)
+            self._absorb_next(block)
+        if block.prev is not None and block.prev.process_id is None:
+            block = block.prev
+            self._unindex_free(block)
+            self._absorb_next(block)
+        insort(self.free_by_size, (block.size, block.start))
+    
+    def _unindex_free(self, block):
+        del self.free_by_size[bisect_left(self.free_by_size, (block.size, block.start))]
+    
+    def _absorb_next(self, block):
+        absorbed = block.next
+        block.size += absorbed.size
+        block.next = absorbed.next
+        if absorbed.next is not None:
+            absorbed.next.prev = block
+        del self.blocks_by_start[absorbed.start]
     
     def _update_stats(self):
-        used_memory = sum(block['size'] for block in self.memory if block['process_id'] is not None)
+        self._sync_memory()
+        used_memory = self.used_memory
         free_memory = self.memory_size - used_memory
-        free_blocks = [block for block in self.memory if block['process_id'] is None]
-        largest_free_block = max([block['size'] for block in free_blocks], default=0)
+        largest_free_block = self.free_by_size[-1][0] if self.free_by_size else 0
         external_fragmentation = 0
         if free_memory > 0:
             external_fragmentation = 1 - (largest_free_block / free_memory)
         
-        internal_fragmentation = 0
-        for process_id, info in self.allocated_processes.items():
-            if info['method'] == 'paging':
-                allocated_size = len(info['frames']) * self.page_size
-                internal_fragmentation += allocated_size - info['size']
-        
         self.stats = {
             'total_memory': self.memory_size,
             'used_memory': used_memory,
             'free_memory': free_memory,
-            'used_percentage': (used_memory / self.memory_size) * 100 if self.memory_size > 0 else 0,
+            'used_percentage': used_memory * self._pct_scale,
             'process_count': len(self.allocated_processes),
             'page_faults': 0,
             'external_fragmentation': external_fragmentation,
-            'internal_fragmentation': internal_fragmentation
+            'internal_fragmentation': self.internal_fragmentation
         }
     
-    def _log_event(self, process_id, event_type, details):
-        event = {
-            'timestamp': time.time(),
-            'process_id': process_id,
-            'event_type': event_type,
-            'details': details
-        }
+    def _log_event(self, process_id, template_id, *args):
+        # Details are formatted from EVENT_TEMPLATES only when read back; the
+        # clock time is formatted once here so readers never have to
+        timestamp = time.time()
+        event = (timestamp, format_timestamp(int(timestamp)), process_id, template_id, args)
         self.recent_events.append(event)
-        if len(self.recent_events) > 10:
-            self.recent_events.pop(0)
+        self._recent_events_view = None
     
 
 # Process Generator
 class ProcessGenerator:
+    # Process sizes are drawn from the RNG in batches of this many
+    SIZE_BATCH = 1024
+    
     def __init__(self, min_size, max_size):
         self.min_size = min_size
         self.max_size = max_size
         self.next_pid = 1
+        self._rng = np.random.default_rng()
+        self._sizes = []
     
     def generate_process(self):
         process_id = self.next_pid
         self.next_pid += 1
-        size = random.randint(self.min_size, self.max_size)
+        if not self._sizes:
+            self._sizes = self._rng.integers(self.min_size, self.max_size, size=self.SIZE_BATCH,
+                                             endpoint=True).tolist()
+        size = self._sizes.pop()
         return process_id, size
     
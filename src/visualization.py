@@ -1,20 +1,32 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 import matplotlib.colors as mcolors
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
 import numpy as np
+import math
+import random
+import time
+
+TABLEAU_RGBA = mcolors.to_rgba_array(list(mcolors.TABLEAU_COLORS.values()))
+FREE_RGBA = np.array(mcolors.to_rgba('lightgrey'))
 
 # Visualization class (Modified to integrate with tkinter)
 class MemoryVisualizer:
+    # Paints are at least this many seconds apart (~30 fps)
+    MIN_DRAW_INTERVAL = 0.033
+    
     def __init__(self):
-        # Create matplotlib figure with two subplots
-        self.fig, self.axes = plt.subplots(2, 1, figsize=(12, 8))
+        # Create matplotlib figure with two subplots; it is embedded directly, so pyplot is not needed
+        self.fig = Figure(figsize=(12, 8))
+        self.axes = self.fig.subplots(2, 1)
         self.fig.tight_layout(pad=3.0)
-        self.process_colors = {}
-        self.color_cycle = iter(mcolors.TABLEAU_COLORS)
+        # Row i of the colour table is the RGBA of the i-th process seen
+        self._pid_to_idx = {}
+        self._color_lut = np.empty((0, 4))
         
-        # Cache for optimization
-        self.memory_patches = []
-        self.page_table_patches = []
+        # Text artists are reused across updates; unused ones are hidden, not removed
+        self.memory_label_pool = []
+        self.memory_address_pool = []
+        self.table_text_pool = []
         
         # Memory axes
         self.memory_ax = self.axes[0]
@@ -23,6 +35,11 @@ class MemoryVisualizer:
         self.memory_ax.set_ylim(0, 1)
         self.memory_ax.set_xticks([])
         self.memory_ax.set_yticks([])
+        # x is in memory addresses; the limit follows the memory size
+        self._memory_xlim = None
+        # All memory blocks are drawn as one collection whose vertices are replaced each update
+        self.memory_collection = PolyCollection([], edgecolors='black', linewidths=1, animated=True)
+        self.memory_ax.add_collection(self.memory_collection)
         
         # Page/Segment table axes
         self.table_ax = self.axes[1]
@@ -31,119 +48,199 @@ class MemoryVisualizer:
         self.table_ax.set_ylim(0, 1)
         self.table_ax.set_xticks([])
         self.table_ax.set_yticks([])
+        # Page frames are drawn as one collection; its cell vertices only change with the frame count
+        self._paging_collection = PolyCollection([], edgecolors='black', linewidths=1, animated=True)
+        self.table_ax.add_collection(self._paging_collection)
+        self._paging_num_frames = None
+        # Full grid layouts of the table, keyed by grid size (cells per side)
+        self._grid_cache = {}
+        # Segments are drawn as one collection too; hidden while paging
+        self._segment_collection = PolyCollection([], edgecolors='black', linewidths=1, animated=True)
+        self.table_ax.add_collection(self._segment_collection)
+        
+        # Everything that changes between updates is animated and blitted over a
+        # cached background captured after each full draw. It covers the whole
+        # figure because address labels at the bar's ends overhang the axes.
+        self._background = None
+        self._method = None
+        # Inputs of the last update of each view; identical updates are skipped
+        self._last_mem_sig = None
+        self._last_tbl_sig = None
+        self._stale = True
+        # Arguments of the latest update not yet painted; older ones are dropped
+        self._pending = None
+        self._last_draw_ts = 0.0
+        self._flush_timer = None
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        self.fig.canvas.mpl_connect('resize_event', self._invalidate_background)
         
     def get_figure(self):
         """Return the matplotlib figure for embedding in tkinter"""
         return self.fig
     
     def _get_process_color(self, process_id):
-        if process_id is None:
-            return 'lightgrey'
-        if process_id not in self.process_colors:
-            try:
-                self.process_colors[process_id] = next(self.color_cycle)
-            except StopIteration:
-                self.process_colors[process_id] = mcolors.to_hex(np.random.rand(3,))
-        return self.process_colors[process_id]
+        if process_id is None or process_id < 0:
+            return FREE_RGBA
+        if process_id not in self._pid_to_idx:
+            idx = len(self._color_lut)
+            if idx < len(TABLEAU_RGBA):
+                color = TABLEAU_RGBA[idx]
+            else:
+                color = (random.random(), random.random(), random.random(), 1.0)
+            self._pid_to_idx[process_id] = idx
+            self._color_lut = np.vstack([self._color_lut, color])
+        return self._color_lut[self._pid_to_idx[process_id]]
+
+    def _get_process_colors(self, pids):
+        """Return an (N, 4) RGBA array for an array of process ids, -1 meaning free"""
+        unique_pids, inverse = np.unique(pids, return_inverse=True)
+        unique_colors = np.array([self._get_process_color(pid) for pid in unique_pids.tolist()]).reshape(-1, 4)
+        return unique_colors[inverse.ravel()]
+
+    def _set_pooled_text(self, ax, pool, index, x, y, text, **style):
+        if index < len(pool):
+            text_obj = pool[index]
+            text_obj.set_position((x, y))
+            text_obj.set_text(text)
+            text_obj.set_visible(True)
+        else:
+            pool.append(ax.text(x, y, text, animated=True, **style))
+
+    def _hide_pooled_texts(self, pool, used):
+        for text_obj in pool[used:]:
+            text_obj.set_visible(False)
+
+    def _snapshot_to_arrays(self, memory_snapshot):
+        """Return block starts, sizes and process ids (-1 for free) as NumPy arrays"""
+        num_blocks = len(memory_snapshot)
+        starts = np.fromiter((block['start'] for block in memory_snapshot), dtype=np.int64, count=num_blocks)
+        sizes = np.fromiter((block['size'] for block in memory_snapshot), dtype=np.int64, count=num_blocks)
+        pids = np.fromiter((-1 if block['process_id'] is None else block['process_id'] for block in memory_snapshot),
+                           dtype=np.int64, count=num_blocks)
+        return starts, sizes, pids
 
     def update_memory_view(self, memory_snapshot, total_memory_size):
-        for patch in self.memory_patches:
-            patch.remove()
-        self.memory_patches = []
-        
         height = 0.6
         y_pos = 0.2
         
-        for block in memory_snapshot:
-            start_pct = block['start'] / total_memory_size
-            width_pct = block['size'] / total_memory_size
-            
-            color = self._get_process_color(block['process_id'])
-            rect = patches.Rectangle((start_pct, y_pos), width_pct, height, 
-                                       facecolor=color, edgecolor='black', linewidth=1)
-            self.memory_ax.add_patch(rect)
-            self.memory_patches.append(rect)
-            
-            if block['size'] / total_memory_size > 0.05:
-                text_x = start_pct + width_pct / 2
-                text_y = y_pos + height / 2
-                text = f"P{block['process_id']}" if block['process_id'] is not None else "Free"
-                text_obj = self.memory_ax.text(text_x, text_y, text, ha='center', va='center', fontsize=8)
-                self.memory_patches.append(text_obj)
-            
-            start_text = self.memory_ax.text(start_pct, y_pos - 0.05, f"{block['start']}", 
-                                             ha='center', va='top', fontsize=6, rotation=90)
-            self.memory_patches.append(start_text)
-            
-            if block == memory_snapshot[-1]:
-                end_text = self.memory_ax.text(start_pct + width_pct, y_pos - 0.05, f"{block['end']}", 
-                                               ha='center', va='top', fontsize=6, rotation=90)
-                self.memory_patches.append(end_text)
+        starts, sizes, pids = self._snapshot_to_arrays(memory_snapshot)
+        signature = (total_memory_size, starts.tobytes(), sizes.tobytes(), pids.tobytes())
+        if signature == self._last_mem_sig:
+            return
+        self._last_mem_sig = signature
+        self._stale = True
+        
+        if total_memory_size != self._memory_xlim:
+            self.memory_ax.set_xlim(0, total_memory_size)
+            self._memory_xlim = total_memory_size
+            self._invalidate_background()
+        
+        num_blocks = len(starts)
+        ends = starts + sizes
+        # Corners of each block, counter-clockwise from bottom left
+        verts = np.empty((num_blocks, 4, 2))
+        verts[:, [0, 3], 0] = starts[:, None]
+        verts[:, [1, 2], 0] = ends[:, None]
+        verts[:, :, 1] = [y_pos, y_pos, y_pos + height, y_pos + height]
+        self.memory_collection.set_verts(verts)
+        self.memory_collection.set_facecolors(self._get_process_colors(pids))
+        
+        label_style = dict(ha='center', va='center', fontsize=8)
+        address_style = dict(ha='center', va='top', fontsize=6, rotation=90)
+        # Only blocks wider than 5% of memory get a name label
+        labelled = np.flatnonzero(sizes > 0.05 * total_memory_size)
+        label_xs = ((starts[labelled] + ends[labelled]) / 2).tolist()
+        for n, (x, pid) in enumerate(zip(label_xs, pids[labelled].tolist())):
+            text = f"P{pid}" if pid >= 0 else "Free"
+            self._set_pooled_text(self.memory_ax, self.memory_label_pool, n,
+                                  x, y_pos + height / 2, text, **label_style)
+        num_labels = len(labelled)
+        
+        for i, start in enumerate(starts.tolist()):
+            self._set_pooled_text(self.memory_ax, self.memory_address_pool, i,
+                                  start, y_pos - 0.05, f"{start}", **address_style)
+        
+        num_addresses = num_blocks
+        if num_blocks:
+            self._set_pooled_text(self.memory_ax, self.memory_address_pool, num_addresses,
+                                  ends[-1], y_pos - 0.05, f"{memory_snapshot[-1]['end']}",
+                                  **address_style)
+            num_addresses += 1
+        self._hide_pooled_texts(self.memory_label_pool, num_labels)
+        self._hide_pooled_texts(self.memory_address_pool, num_addresses)
         
         self.memory_ax.set_title('Memory Allocation')
 
+    def _grid_layout(self, count):
+        """Return the cell size, cell corners and cell vertices of a square grid of `count` cells"""
+        grid_size = math.isqrt(count - 1) + 1
+        layout = self._grid_cache.get(grid_size)
+        if layout is None:
+            cell_size = 1 / grid_size
+            row, col = np.divmod(np.arange(grid_size * grid_size), grid_size)
+            xs = col * cell_size
+            ys = 1 - (row + 1) * cell_size
+            cell = cell_size * 0.9
+            verts = np.stack([np.stack([xs, ys], -1), np.stack([xs + cell, ys], -1),
+                              np.stack([xs + cell, ys + cell], -1), np.stack([xs, ys + cell], -1)], axis=1)
+            layout = (cell_size, xs.tolist(), ys.tolist(), verts)
+            self._grid_cache[grid_size] = layout
+        cell_size, xs, ys, verts = layout
+        # Cells fill the grid row by row, so the first `count` cells are the ones in use
+        return cell_size, xs[:count], ys[:count], verts[:count]
+
     def update_page_table_view(self, page_table_snapshot, page_size, total_memory_size, method):
-        for patch in self.page_table_patches:
-            patch.remove()
-        self.page_table_patches = []
+        num_frames = len(page_table_snapshot)
+        pids = np.fromiter((-1 if frame['process_id'] is None else frame['process_id']
+                            for frame in page_table_snapshot), dtype=np.int64, count=num_frames)
+        signature = (method, page_size, pids.tobytes())
+        if signature == self._last_tbl_sig:
+            return
+        self._last_tbl_sig = signature
+        self._stale = True
         
         if method == "paging":
-            num_frames = len(page_table_snapshot)
-            grid_size = int(np.ceil(np.sqrt(num_frames)))
-            cell_width = 1 / grid_size
-            cell_height = 1 / grid_size
+            self._segment_collection.set_visible(False)
+            cell_size, xs, ys, verts = self._grid_layout(num_frames)
+            if num_frames != self._paging_num_frames:
+                self._paging_collection.set_verts(verts)
+                self._paging_num_frames = num_frames
+            self._paging_collection.set_facecolors(self._get_process_colors(pids))
+            self._paging_collection.set_visible(True)
             
-            for i, frame in enumerate(page_table_snapshot):
-                row = i // grid_size
-                col = i % grid_size
-                
-                x = col * cell_width
-                y = 1 - (row + 1) * cell_height
-                
-                color = self._get_process_color(frame['process_id'])
-                rect = patches.Rectangle((x, y), cell_width * 0.9, cell_height * 0.9,
-                                           facecolor=color, edgecolor='black', linewidth=1)
-                self.table_ax.add_patch(rect)
-                self.page_table_patches.append(rect)
-                
+            for i, (frame, x, y) in enumerate(zip(page_table_snapshot, xs, ys)):
                 text = f"F{frame['frame_id']}"
                 if frame['process_id'] is not None:
                     text += f"\nP{frame['process_id']}"
-                text_obj = self.table_ax.text(x + cell_width * 0.45, y + cell_height * 0.45, 
-                                              text, ha='center', va='center', fontsize=8)
-                self.page_table_patches.append(text_obj)
+                self._set_pooled_text(self.table_ax, self.table_text_pool, i,
+                                      x + cell_size * 0.45, y + cell_size * 0.45,
+                                      text, ha='center', va='center', fontsize=8)
+            self._hide_pooled_texts(self.table_text_pool, num_frames)
             
             self.table_ax.set_title('Page Table')
         else:
+            self._paging_collection.set_visible(False)
             segments = [block for block in page_table_snapshot if block['process_id'] is not None]
             num_segments = len(segments)
+            self._hide_pooled_texts(self.table_text_pool, num_segments)
             if num_segments == 0:
+                self._segment_collection.set_visible(False)
                 return
-            grid_size = int(np.ceil(np.sqrt(num_segments)))
-            cell_width = 1 / grid_size
-            cell_height = 1 / grid_size
+            cell_size, xs, ys, verts = self._grid_layout(num_segments)
+            segment_pids = np.fromiter((segment['process_id'] for segment in segments), dtype=np.int64, count=num_segments)
+            self._segment_collection.set_verts(verts)
+            self._segment_collection.set_facecolors(self._get_process_colors(segment_pids))
+            self._segment_collection.set_visible(True)
             
-            for i, segment in enumerate(segments):
-                row = i // grid_size
-                col = i % grid_size
-                
-                x = col * cell_width
-                y = 1 - (row + 1) * cell_height
-                
-                color = self._get_process_color(segment['process_id'])
-                rect = patches.Rectangle((x, y), cell_width * 0.9, cell_height * 0.9,
-                                           facecolor=color, edgecolor='black', linewidth=1)
-                self.table_ax.add_patch(rect)
-                self.page_table_patches.append(rect)
-                
+            for i, (segment, x, y) in enumerate(zip(segments, xs, ys)):
                 start_addr = segment['start_address']
                 end_addr = segment['end_address']
                 size = end_addr - start_addr + 1
                 
                 text = f"P{segment['process_id']}\nAddr: {start_addr}\nSize: {size}"
-                text_obj = self.table_ax.text(x + cell_width * 0.45, y + cell_height * 0.45, 
-                                              text, ha='center', va='center', fontsize=8)
-                self.page_table_patches.append(text_obj)
+                self._set_pooled_text(self.table_ax, self.table_text_pool, i,
+                                      x + cell_size * 0.45, y + cell_size * 0.45,
+                                      text, ha='center', va='center', fontsize=8)
             
             self.table_ax.set_title('Segment Table')
 
@@ -152,9 +249,69 @@ class MemoryVisualizer:
                              stats, events,
                              total_memory_size, page_size,
                              method):
+        """Update both views; events may be any iterable, such as the engine's bounded window"""
+        if method != self._method:
+            # The table title changes with the method, so the cached background is stale
+            self._method = method
+            self._invalidate_background()
         self.update_memory_view(memory_snapshot, total_memory_size)
         self.update_page_table_view(page_table_snapshot, page_size, total_memory_size, method)
 
+    def request_update(self, *args):
+        """Queue update_visualization(*args), painting at most once per MIN_DRAW_INTERVAL"""
+        self._pending = args
+        self._flush_if_due()
+
+    def _flush_if_due(self):
+        if self._pending is None:
+            return
+        remaining = self.MIN_DRAW_INTERVAL - (time.perf_counter() - self._last_draw_ts)
+        if remaining > 0:
+            # Too soon; paint whatever is latest once the interval has passed
+            if self._flush_timer is None:
+                self._flush_timer = self.fig.canvas.new_timer()
+                self._flush_timer.single_shot = True
+                self._flush_timer.add_callback(self._flush_if_due)
+            self._flush_timer.stop()
+            self._flush_timer.interval = max(1, int(remaining * 1000))
+            self._flush_timer.start()
+            return
+        args, self._pending = self._pending, None
+        self.update_visualization(*args)
+        self.draw()
+        self._last_draw_ts = time.perf_counter()
+
+    def draw(self):
+        """Blit the animated artists, or request a full redraw if no background is cached"""
+        canvas = self.fig.canvas
+        if self._background is None:
+            canvas.draw_idle()
+            self._stale = False
+            return
+        if not self._stale:
+            return
+        self._stale = False
+        canvas.restore_region(self._background)
+        self._draw_animated()
+        canvas.blit(self.fig.bbox)
+
+    def _draw_animated(self):
+        for ax in (self.memory_ax, self.table_ax):
+            animated = [artist for artist in ax.get_children() if artist.get_animated()]
+            for artist in sorted(animated, key=lambda artist: artist.get_zorder()):
+                ax.draw_artist(artist)
+
+    def _on_draw(self, event):
+        canvas = self.fig.canvas
+        if not canvas.supports_blit:
+            return
+        self._background = canvas.copy_from_bbox(self.fig.bbox)
+        # A full draw skips animated artists, so paint them over the fresh background
+        self._draw_animated()
+
+    def _invalidate_background(self, event=None):
+        self._background = None
+
 from tkinter import ttk, font
 
 class ModernUI:
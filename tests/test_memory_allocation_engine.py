@@ -0,0 +1,55 @@
+import os
+import random
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+from memory_allocation_engine import MemoryManager, AllocationMethod
+
+
+class FreeFrameTrackingTest(unittest.TestCase):
+    def assert_free_frames_consistent(self, manager):
+        free = set((manager.frame_owner < 0).nonzero()[0].tolist())
+        queued = list(manager.free_frames)
+        self.assertEqual(len(queued), len(set(queued)))
+        self.assertLessEqual(free, set(queued))
+        self.assertEqual(manager.free_frame_count, len(free))
+
+    def test_segmentation_at_large_frame_count(self):
+        # 65,536 frames; claiming frames used to scan the free-frame deque once per frame
+        manager = MemoryManager(1 << 20, 16)
+        rng = random.Random(0)
+        live = []
+        started = time.perf_counter()
+        for pid in range(600):
+            if live and rng.random() < 0.4:
+                self.assertTrue(manager.deallocate_process(live.pop(rng.randrange(len(live)))))
+            elif manager.allocate_process(pid, rng.randint(1000, 20000), AllocationMethod.SEGMENTATION):
+                live.append(pid)
+        elapsed = time.perf_counter() - started
+        self.assert_free_frames_consistent(manager)
+        self.assertLess(elapsed, 10)
+
+    def test_paging_skips_frames_claimed_by_segmentation(self):
+        manager = MemoryManager(1 << 20, 16)
+        self.assertTrue(manager.allocate_process(1, 16 * 1000, AllocationMethod.SEGMENTATION))
+        self.assertTrue(manager.allocate_process(2, 16 * 500, AllocationMethod.PAGING))
+        frames = manager.allocated_processes[2]['frames']
+        self.assertTrue((frames >= 1000).all())
+        self.assertTrue(manager.deallocate_process(1))
+        self.assertTrue(manager.deallocate_process(2))
+        self.assert_free_frames_consistent(manager)
+        self.assertEqual(manager.free_frame_count, len(manager.frame_owner))
+
+    def test_exhausted_frames_are_refused(self):
+        manager = MemoryManager(256, 16)
+        self.assertTrue(manager.allocate_process(1, 200, AllocationMethod.SEGMENTATION))
+        self.assertFalse(manager.allocate_process(2, 16 * 5, AllocationMethod.PAGING))
+        self.assertTrue(manager.allocate_process(3, 16 * 3, AllocationMethod.PAGING))
+        self.assert_free_frames_consistent(manager)
+
+
+if __name__ == '__main__':
+    unittest.main()